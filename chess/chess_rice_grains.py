@@ -16,28 +16,9 @@
 # limitations under the License.
 #
 
-class SquareGenerator:
+FILES = "abcdefgh"
 
-    def __init__(self):
-        self._current_rank = 1
-        self._current_file = 'a'
-
-    def next_square(self) -> str:
-        result = self._current_file + str(self._current_rank)
-        if self._current_file == 'h':
-            self._current_file = 'a'
-            self._current_rank += 1
-        else:
-            self._current_file = chr(ord(self._current_file) + 1)
-        return result
-        
-
-square_generator = SquareGenerator()
-grain_counts = []
 for i in range(0, 64):
-    square = square_generator.next_square()
-    grains_on_square = 1 if i == 0 else 2 * grain_counts[i - 1]
-    print(f"{square}: {grains_on_square}")
-    grain_counts.append(grains_on_square)
+    print(f"{FILES[i % 8]}{i // 8 + 1}: {1 << i}")
 print()
-print(f"Sum: {sum(grain_counts)}")
+print(f"Sum: {(1 << 64) - 1}")
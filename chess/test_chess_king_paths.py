@@ -24,8 +24,8 @@ from chess_king_paths import search_paths
 def test_there_is_no_path_to_the_same_square():
     paths = search_paths("e4", "e4", 0)
 
-    # no path means empty tuple
-    assert paths == ()
+    # no path means empty list
+    assert paths == []
 
 
 def test_single_move_path():
@@ -54,7 +54,7 @@ def test_there_is_no_path_with_too_few_moves():
     paths = search_paths("e4", "c4", 1)
 
     # c4 cannot be reached from e4 in 1 move
-    assert paths == ()
+    assert paths == []
 
 
 def test_corner_to_corner():
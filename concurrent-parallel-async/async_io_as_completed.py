@@ -26,13 +26,13 @@ async def get_message(i: int) -> str:
     return f"Message #{i} (sleep = {duration:.2f} sec)"
 
 
-async def run_test() -> tuple[str, ...]:
+async def run_test() -> list[str]:
     couroutines = [get_message(i) for i in range(1, 21)]
     result = []
     for future in as_completed(couroutines):
         message = await future
         result.append(message)
-    return tuple(result)
+    return result
 
 
 def main() -> None:
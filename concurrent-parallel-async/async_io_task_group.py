@@ -17,31 +17,32 @@
 #
 
 from asyncio import TaskGroup, run, sleep
-from itertools import cycle
+from math import prod
 from random import randint
 
 from colorama import init, Fore
 
 
+COLORS = (Fore.RED, Fore.GREEN, Fore.BLUE, Fore.MAGENTA, Fore.CYAN, Fore.YELLOW)
+
+
 async def factorial(n: int, color: str) -> str:
     if n < 0:
         raise ValueError("Factorial is not defined for negative numbers.")
     result = 1
-    for i in range(2, n + 1):
-        result *= i
-        if i % 50 == 0:
-            print(f"{color}Task yielded control...")
-            await sleep(0)
+    for chunk_start in range(2, n + 1, 50):
+        result *= prod(range(chunk_start, min(chunk_start + 50, n + 1)))
+        print(f"{color}Task yielded control...")
+        await sleep(0)
     print(f"{color}Task ready...")
     return f"factorial({n}) = {result}"
 
 
 async def run_tasks() -> tuple[str, ...]:
-    colors = cycle([Fore.RED, Fore.GREEN, Fore.BLUE, Fore.MAGENTA, Fore.CYAN, Fore.YELLOW])
     async with TaskGroup() as task_group:
         task_list = []
-        for _ in range(5):
-            task = task_group.create_task(factorial(randint(100, 200), next(colors)))
+        for i in range(5):
+            task = task_group.create_task(factorial(randint(100, 200), COLORS[i % len(COLORS)]))
             task_list.append(task)
 
         result_list = []
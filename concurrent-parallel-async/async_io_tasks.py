@@ -17,33 +17,29 @@
 #
 
 from argparse import ArgumentParser, Namespace, RawTextHelpFormatter
-from asyncio import create_task, run, sleep
+from asyncio import create_task, gather, run, to_thread
 from dataclasses import dataclass
+from functools import lru_cache
 from math import isqrt
 from pprint import pprint
 
 from colorama import init, Fore
 
 
-@dataclass(frozen=True)
-class PerfectNumber:
-    number: int
-    divisors: tuple[int, ...]
-
-
 @dataclass(frozen=True)
 class TestResult:
-    prime_number: tuple[int, ...]
-    perfect_number: tuple[int, ...]
+    prime_number: list[int]
+    perfect_number: list[int]
 
 
 def epilog() -> str:
     return """
 This script finds prime and perfect numbers in a given range. Both search tasks run concurrently
-using asyncio. During the search, each task will periodically pause for a short time to simulate
-a long-running task. Whenever sleeping, each of the tasks will print a message indicating that it
-is waiting. For educational purposes, the script uses colorama to color the output of the waiting
-messages. Each task uses a different color so the user can easily distinguish between them.
+using asyncio. As the searches are CPU-bound, they are executed in worker threads via
+asyncio.to_thread so that they do not block the event loop. During the search, each task will
+periodically print a progress message. For educational purposes, the script uses colorama to
+color the output of the progress messages. Each task uses a different color so the user can
+easily distinguish between them.
 """
 
 
@@ -83,19 +79,19 @@ def parse_cmd_line_args() -> Namespace:
     return params
 
 
-async def find_prime_numbers(start: int, end: int, max_results: int | None) -> tuple[int, ...]:
+def find_prime_numbers(start: int, end: int, max_results: int | None) -> list[int]:
     result = []
     for value in range(start, end + 1):
         if value % 50 == 0:
-            print(f"{Fore.GREEN}Prime number search is yielding control...")
-            await sleep(0)
+            print(f"{Fore.GREEN}Prime number search is still in progress...")
         if is_prime_number(value):
             result.append(value)
             if max_results and len(result) >= max_results:
                 break
-    return tuple(result)
+    return result
 
 
+@lru_cache(maxsize=None)
 def is_prime_number(value: int) -> bool:
     if value < 2:
         return False
@@ -109,36 +105,39 @@ def is_prime_number(value: int) -> bool:
     return True
 
 
-async def find_perfect_numbers(start: int, end: int, max_results: int | None) -> tuple[int, ...]:
+def find_perfect_numbers(start: int, end: int, max_results: int | None) -> list[int]:
     result = []
     for value in range(start, end + 1):
         if value % 1000 == 0:
-            print(f"{Fore.BLUE}Perfect number search is yielding control...")
-            await sleep(0)
+            print(f"{Fore.BLUE}Perfect number search is still in progress...")
         if is_perfect_number(value):
             result.append(value)
             if max_results and len(result) >= max_results:
                 break
-    return tuple(result)
+    return result
 
 
-def is_perfect_number(value: int) -> PerfectNumber | None:
-    divisors = []
-    for divisor in range(1, value // 2 + 1):
+@lru_cache(maxsize=None)
+def is_perfect_number(value: int) -> bool:
+    if value < 2:
+        return False
+    divisors_sum = 1
+    for divisor in range(2, isqrt(value) + 1):
         if value % divisor == 0:
-            divisors.append(divisor)
-    if sum(divisors) == value:
-        return PerfectNumber(number=value, divisors=tuple(divisors))
-    else:
-        return None
+            divisors_sum += divisor
+            quotient = value // divisor
+            if quotient != divisor:
+                divisors_sum += quotient
+            if divisors_sum > value:
+                return False
+    return divisors_sum == value
 
 
 async def invoke_tests(start: int, end: int, max_results: int | None) -> TestResult:
-    prime_number_task = create_task(find_prime_numbers(start, end, max_results))
-    perfect_number_task = create_task(find_perfect_numbers(start, end, max_results))
+    prime_number_task = create_task(to_thread(find_prime_numbers, start, end, max_results))
+    perfect_number_task = create_task(to_thread(find_perfect_numbers, start, end, max_results))
 
-    prime_number_result = await prime_number_task
-    perfect_number_result = await perfect_number_task
+    prime_number_result, perfect_number_result = await gather(prime_number_task, perfect_number_task)
 
     print()
     print(f"{Fore.GREEN}Prime task status - done={prime_number_task.done()}, cancelled={prime_number_task.cancelled()}")
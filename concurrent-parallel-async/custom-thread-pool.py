@@ -16,64 +16,49 @@
 # limitations under the License.
 #
 
-from collections import deque
 from colorama import init, Fore
+from itertools import count
+from queue import Queue
 from random import randint
-from threading import Condition, Lock, Thread
+from threading import Lock, Thread
 from time import sleep
 from typing import Callable
 
 
-class BlockingQueue:
-
-    def __init__(self) -> None:
-        self._lock = Lock()
-        self._condition = Condition(lock=self._lock)
-        self._queue = deque()
-
-    def enqueue(self, action: Callable) -> int:
-        with self._lock:
-            self._queue.append(action)
-            current_size = len(self._queue)
-            if current_size == 1:
-                self._condition.notify_all()
-            return current_size
-
-    def dequeue(self) -> Callable:
-        with self._lock:
-            while len(self._queue) == 0:
-                self._condition.wait()
-            return self._queue.popleft()
-
-
 class ThreadPool:
-    
+
     def __init__(self, min_workers: int, max_workers: int) -> None:
-        self._queue = BlockingQueue()
+        self._queue = Queue()
         self._lock = Lock()
         self._min_workers = min_workers
         self._max_workers = max_workers
         self._workers = [WorkerThread(self._queue) for _ in range(0, self._min_workers)]
 
     def submit(self, action: Callable) -> None:
-        queue_size = self._queue.enqueue(action)
+        self._queue.put(action)
+        queue_size = self._queue.qsize()
         with self._lock:
             if queue_size > 5 and len(self._workers) < self._max_workers:
                 self._workers.append(WorkerThread(self._queue))
                 print(f"{Fore.GREEN} New worker started, current number of workers is {len(self._workers)}")
 
+    def shutdown(self) -> None:
+        # a single sentinel is sufficient - each worker re-injects it before terminating,
+        # so the sentinel is eventually seen by all workers
+        self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+
 
 class Sequence:
 
     def __init__(self) -> None:
-        self._current_value = 0
-        self._lock = Lock()
+        self._counter = count(1)
 
     def next_value(self) -> int:
-        with self._lock:
-            self._current_value += 1
-            return self._current_value
-        
+        # next() on an itertools.count is a single C call, i.e. atomic under the GIL
+        return next(self._counter)
+
 
 class WorkerThread(Thread):
     
@@ -92,18 +77,21 @@ class WorkerThread(Thread):
         "Worker-10": Fore.LIGHTYELLOW_EX,
     }
 
-    def __init__(self, queue: BlockingQueue) -> None:
-        super().__init__(name=f"Worker-{self._sequence.next_value()}")
+    def __init__(self, queue: Queue) -> None:
+        super().__init__(name=f"Worker-{self._sequence.next_value()}", daemon=True)
         self._queue = queue
+        self._color = self._color_mapping.get(self.name, Fore.WHITE)
         self.start()
 
     def run(self) -> None:
         while True:
-            action = self._queue.dequeue()
-            fore = self._color_mapping[self.name]
-            print(f"{fore} {self.name} is going to execute task")
+            action = self._queue.get()
+            if action is None:
+                self._queue.put(None)
+                return
+            print(f"{self._color} {self.name} is going to execute task")
             action()
-            print(f"{fore} {self.name} has completed task execution")
+            print(f"{self._color} {self.name} has completed task execution")
 
 
 def main() -> None:
@@ -111,6 +99,7 @@ def main() -> None:
     thread_pool = ThreadPool(3, 10)
     for _ in range(0, 20):
         thread_pool.submit(lambda: sleep(5 + randint(0, 10)))
+    thread_pool.shutdown()
 
 
 if __name__ == "__main__":
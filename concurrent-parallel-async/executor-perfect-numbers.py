@@ -17,27 +17,34 @@
 #
 
 from __future__ import annotations
-from argparse import ArgumentParser, Namespace, RawTextHelpFormatter
+import sys
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
-from multiprocessing import cpu_count, current_process
+from itertools import count
+from math import isqrt
+from multiprocessing import cpu_count, current_process, get_all_start_methods, get_context
 from time import perf_counter
-from typing import List, Tuple
+from typing import List, Tuple, TYPE_CHECKING
 
+if TYPE_CHECKING:
+    # resolves the annotations below for type checkers without undoing the
+    # runtime deferral of the argparse import
+    from argparse import ArgumentParser, Namespace
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class SearchRange:
     min: int
     max: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PerfectNumber:
     number: int
     divisors: Tuple[int, ...]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SearchResult:
     process: str
     duration_millis: int
@@ -62,9 +69,13 @@ class Stopwatch:
 
 def epilog() -> str:
     return """
-This script finds all perfect numbers in the given range using parallel processing.
-Depending on the specified executor type, it uses either multithreading or multiprocessing.
-The prime numbers are written to the specified output file.
+This script finds all perfect numbers in the given range. By default, it enumerates the
+candidates directly via the Euclid-Euler theorem (an even number is perfect if and only if
+it has the form 2^(p-1) * (2^p - 1) with 2^p - 1 prime), which resolves even huge ranges
+in a fraction of a second. Alternatively, a brute-force search testing every single value
+in the range can be requested; it uses parallel processing, and depending on the specified
+executor type, it uses either multithreading or multiprocessing. The perfect numbers are
+written to the specified output file.
 
 A perfect number is a positive integer that is equal to the sum of its proper positive divisors, excluding itself.
 For example, the first perfect number is 6, because its divisors are 1, 2, and 3, and 1 + 2 + 3 = 6.
@@ -72,6 +83,10 @@ For example, the first perfect number is 6, because its divisors are 1, 2, and 3
 
 
 def create_command_line_arguments_parser() -> ArgumentParser:
+    # argparse is only needed in the parent - a function-local import keeps it out
+    # of the workers when the pool has to fall back to the spawn start method
+    from argparse import ArgumentParser, RawTextHelpFormatter
+
     parser = ArgumentParser(description="Parallel search of perfect numbers", formatter_class=RawTextHelpFormatter, epilog=epilog())
 
     # positional mandatory arguments
@@ -96,7 +111,8 @@ def create_command_line_arguments_parser() -> ArgumentParser:
         dest="executor",
         choices=["thread", "process"],
         default="thread",
-        help="allows to specify whether multithreading or multiprocessing is to be used (default = thread)",
+        help="allows to specify whether multithreading or multiprocessing is to be used (default = thread);\n"
+             "on builds with the GIL enabled, the thread option falls back to multiprocessing",
         type=str)
 
     parser.add_argument("-w", "--workers",
@@ -105,6 +121,12 @@ def create_command_line_arguments_parser() -> ArgumentParser:
         help="optional number of workers (threads or processes) to be used (default = number of available CPU cores)",
         type=int)
 
+    parser.add_argument("--brute-force",
+        dest="brute_force",
+        default=False,
+        action="store_true",
+        help="if specified, every single value in the range is tested instead of the Euclid-Euler enumeration")
+
     return parser
 
 
@@ -129,24 +151,96 @@ def current_process_name() -> str:
     return process.name
 
 
+def create_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    # fork inherits the parent's already-imported modules, so worker startup is
+    # close to free; spawn (the only option on Windows) re-imports this module
+    mp_context = get_context("fork") if "fork" in get_all_start_methods() else None
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context)
+
+
 def create_executor(executor: str, max_workers: int) -> ThreadPoolExecutor | ProcessPoolExecutor:
     if executor == "process":
-        return ProcessPoolExecutor(max_workers=max_workers)
+        return create_process_pool(max_workers)
     elif executor == "thread":
+        if getattr(sys, "_is_gil_enabled", lambda: True)():
+            print("WARNING: The GIL serializes CPU-bound threads - falling back to multiprocessing.")
+            print("Use a free-threaded Python build if multithreading is really desired.")
+            return create_process_pool(max_workers)
         return ThreadPoolExecutor(max_workers=max_workers)
     else:
         raise ValueError(f"Unknown executor type: {executor}. Use 'thread' or 'process'.")
 
 
+def is_prime_number(value: int) -> bool:
+    # 6k +/- 1 wheel - skips multiples of 2 and 3, i.e. two thirds of the candidates
+    if value < 2:
+        return False
+    if value < 4:
+        return True
+    if value % 2 == 0 or value % 3 == 0:
+        return False
+    divisor = 5
+    while divisor * divisor <= value:
+        if value % divisor == 0 or value % (divisor + 2) == 0:
+            return False
+        divisor += 6
+    return True
+
+
+def is_mersenne_prime(exponent: int) -> bool:
+    # Lucas-Lehmer primality test for 2^exponent - 1 (exponent must be an odd prime)
+    mersenne = (1 << exponent) - 1
+    residue = 4
+    for _ in range(exponent - 2):
+        residue = (residue * residue - 2) % mersenne
+    return residue == 0
+
+
+def euclid_euler_divisors(exponent: int) -> Tuple[int, ...]:
+    # proper divisors of 2^(p-1) * (2^p - 1) with q = 2^p - 1 prime:
+    # 1, 2, 4, ..., 2^(p-1) and q, 2q, 4q, ..., 2^(p-2)*q
+    mersenne = (1 << exponent) - 1
+    powers = [1 << i for i in range(exponent)]
+    multiples = [(1 << i) * mersenne for i in range(exponent - 1)]
+    return tuple(sorted(powers + multiples))
+
+
+def find_perfect_numbers_via_euclid_euler(start: int, end: int) -> List[PerfectNumber]:
+    result = []
+    for exponent in count(2):
+        candidate = (1 << (exponent - 1)) * ((1 << exponent) - 1)
+        if candidate > end:
+            break
+        if not is_prime_number(exponent):
+            continue
+        if exponent > 2 and not is_mersenne_prime(exponent):
+            continue
+        if candidate >= start:
+            result.append(PerfectNumber(number=candidate, divisors=euclid_euler_divisors(exponent)))
+    return result
+
+
 def is_perfect_number(value: int) -> PerfectNumber | None:
-    divisors = []
-    for divisor in range(1, value // 2 + 1):
+    if value < 2:
+        return None
+    # divisors come in pairs (d, value/d), so scanning up to the square root is
+    # enough; the running sum aborts abundant numbers long before the scan ends
+    divisors_sum = 1
+    divisors = [1]
+    for divisor in range(2, isqrt(value) + 1):
         if value % divisor == 0:
+            paired_divisor = value // divisor
             divisors.append(divisor)
-    if sum(divisors) == value:
-        return PerfectNumber(number=value, divisors=tuple(divisors))
-    else:
-        return None
+            if paired_divisor != divisor:
+                divisors.append(paired_divisor)
+                divisors_sum += divisor + paired_divisor
+            else:
+                divisors_sum += divisor
+            if divisors_sum > value:
+                return None
+    if divisors_sum == value:
+        return PerfectNumber(number=value, divisors=tuple(sorted(divisors)))
+    return None
 
 
 def get_perfect_numbers(search_range: SearchRange) -> SearchResult:
@@ -180,8 +274,20 @@ def format_duration(duration_sec: float) -> str:
     return f"{int(hours):02}:{int(minutes):02}:{int(seconds):02}"
 
 
-def main() -> None:
-    command_line_arguments = parse_command_line_arguments()
+def euclid_euler_search(command_line_arguments: Namespace) -> None:
+    print()
+    print(f"Range start:  {command_line_arguments.start}")
+    print(f"Range end:    {command_line_arguments.end}")
+    print()
+    stopwatch = Stopwatch()
+    perfect_numbers = find_perfect_numbers_via_euclid_euler(command_line_arguments.start, command_line_arguments.end)
+    duration_millis = stopwatch.elapsed_time_millis()
+    write_to_file(perfect_numbers, command_line_arguments.output_file)
+    print(f"Overall number of perfect numbers found: {len(perfect_numbers)}")
+    print(f"Overall search duration:                 {duration_millis} ms ({format_duration(duration_millis / 1000)})")
+
+
+def brute_force_search(command_line_arguments: Namespace) -> None:
     print_request(
         command_line_arguments.start,
         command_line_arguments.end,
@@ -189,30 +295,36 @@ def main() -> None:
         command_line_arguments.workers,
         command_line_arguments.executor
     )
-    future_list = []
-    
     with create_executor(command_line_arguments.executor, command_line_arguments.workers) as executor:
         stopwatch = Stopwatch()
-        start = command_line_arguments.start
-        while start <= command_line_arguments.end:
-            end = min(start + command_line_arguments.bulk_size - 1, command_line_arguments.end)
-            future = executor.submit(get_perfect_numbers, SearchRange(start, end))
-            future_list.append(future)
-            start += command_line_arguments.bulk_size
+        search_ranges = [
+            SearchRange(start, min(start + command_line_arguments.bulk_size - 1, command_line_arguments.end))
+            for start in range(command_line_arguments.start, command_line_arguments.end + 1, command_line_arguments.bulk_size)
+        ]
+        # chunksize > 1 batches the pickling of tasks, which dominates for small bulk sizes;
+        # the 4x oversubscription preserves load balance across the workers
+        chunksize = max(1, len(search_ranges) // (command_line_arguments.workers * 4))
 
         print()
         perfect_numbers = []
-        for i, future in enumerate(future_list):
-            search_result = future.result()
+        for i, search_result in enumerate(executor.map(get_perfect_numbers, search_ranges, chunksize=chunksize)):
             perfect_numbers += search_result.perfect_numbers
             if (i + 1) % 25 == 0:
-                print(f"Bulk {i + 1}/{len(future_list)} completed...")
+                print(f"Bulk {i + 1}/{len(search_ranges)} completed...")
 
         duration_millis = stopwatch.elapsed_time_millis()
         write_to_file(perfect_numbers, command_line_arguments.output_file)
         print(f"Overall number of perfect numbers found: {len(perfect_numbers)}")
         print(f"Overall search duration:                 {duration_millis} ms ({format_duration(duration_millis / 1000)})")
-        print(f"Batch count:                             {len(future_list)}")
+        print(f"Batch count:                             {len(search_ranges)}")
+
+
+def main() -> None:
+    command_line_arguments = parse_command_line_arguments()
+    if command_line_arguments.brute_force:
+        brute_force_search(command_line_arguments)
+    else:
+        euclid_euler_search(command_line_arguments)
 
 
 if __name__ == "__main__":
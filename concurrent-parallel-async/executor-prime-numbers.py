@@ -17,27 +17,35 @@
 #
 
 from __future__ import annotations
-from argparse import ArgumentParser, Namespace, RawTextHelpFormatter
+import sys
+from array import array
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from math import isqrt
-from multiprocessing import cpu_count, current_process
+from multiprocessing import cpu_count, current_process, get_all_start_methods, get_context
+from multiprocessing.shared_memory import SharedMemory
 from time import perf_counter
-from typing import List
+from typing import List, TYPE_CHECKING
 
+if TYPE_CHECKING:
+    # resolves the annotations below for type checkers without undoing the
+    # runtime deferral of the argparse import
+    from argparse import ArgumentParser, Namespace
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class SearchRange:
     min: int
     max: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SearchResult:
     process: str
     duration_millis: int
     search_range: SearchRange
-    prime_numbers: List[int]
+    # packed 64-bit ints - pickled via the buffer protocol, i.e. one raw memory copy
+    prime_numbers: array
 
 
 class Stopwatch:
@@ -64,6 +72,10 @@ The prime numbers are written to the specified output file.
 
 
 def create_command_line_arguments_parser() -> ArgumentParser:
+    # argparse is only needed in the parent - a function-local import keeps it out
+    # of the workers when the pool has to fall back to the spawn start method
+    from argparse import ArgumentParser, RawTextHelpFormatter
+
     parser = ArgumentParser(description="Parallel search of prime numbers", formatter_class=RawTextHelpFormatter, epilog=epilog())
 
     # positional mandatory arguments
@@ -88,7 +100,8 @@ def create_command_line_arguments_parser() -> ArgumentParser:
         dest="executor",
         choices=["thread", "process"],
         default="thread",
-        help="allows to specify whether multithreading or multiprocessing is to be used (default = thread)",
+        help="allows to specify whether multithreading or multiprocessing is to be used (default = thread);\n"
+             "on builds with the GIL enabled, the thread option falls back to multiprocessing",
         type=str)
 
     parser.add_argument("-w", "--workers",
@@ -121,31 +134,89 @@ def current_process_name() -> str:
     return process.name
 
 
-def create_executor(executor: str, max_workers: int) -> ThreadPoolExecutor | ProcessPoolExecutor:
+def create_process_pool(max_workers: int, initializer_args: dict) -> ProcessPoolExecutor:
+    # fork inherits the parent's already-imported modules, so worker startup is
+    # close to free; spawn (the only option on Windows) re-imports this module
+    mp_context = get_context("fork") if "fork" in get_all_start_methods() else None
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context, **initializer_args)
+
+
+def create_executor(executor: str, max_workers: int, shm_name: str, prime_count: int) -> ThreadPoolExecutor | ProcessPoolExecutor:
+    initializer_args = {"initializer": attach_base_primes, "initargs": (shm_name, prime_count)}
     if executor == "process":
-        return ProcessPoolExecutor(max_workers=max_workers)
+        return create_process_pool(max_workers, initializer_args)
     elif executor == "thread":
-        return ThreadPoolExecutor(max_workers=max_workers)
+        if getattr(sys, "_is_gil_enabled", lambda: True)():
+            print("WARNING: The GIL serializes CPU-bound threads - falling back to multiprocessing.")
+            print("Use a free-threaded Python build if multithreading is really desired.")
+            return create_process_pool(max_workers, initializer_args)
+        return ThreadPoolExecutor(max_workers=max_workers, **initializer_args)
     else:
         raise ValueError(f"Unknown executor type: {executor}. Use 'thread' or 'process'.")
 
 
 def is_prime_number(value: int) -> bool:
-    if value % 2 == 0:
+    # reference implementation (the search itself uses the segmented sieve) - the
+    # 6k +/- 1 wheel skips multiples of 2 and 3, i.e. two thirds of the candidates
+    if value < 2:
+        return False
+    if value < 4:
+        return True
+    if value % 2 == 0 or value % 3 == 0:
         return False
-    for divider in range(3, isqrt(value) + 1, 2):
-        if value % divider == 0:
+    divider = 5
+    while divider * divider <= value:
+        if value % divider == 0 or value % (divider + 2) == 0:
             return False
+        divider += 6
     return True
 
 
+def sieve_primes(limit: int) -> List[int]:
+    # plain Sieve of Eratosthenes; the composite marking is a C-level slice assignment
+    if limit < 2:
+        return []
+    sieve = bytearray(b"\x01") * (limit + 1)
+    sieve[0:2] = b"\x00\x00"
+    for value in range(2, isqrt(limit) + 1):
+        if sieve[value]:
+            sieve[value * value::value] = b"\x00" * len(sieve[value * value::value])
+    return [value for value, is_prime in enumerate(sieve) if is_prime]
+
+
+base_primes = array("q")
+
+
+def attach_base_primes(shm_name: str, prime_count: int) -> None:
+    # executed once per worker - the base primes are read from the shared-memory
+    # block published by the parent instead of being pickled with every task
+    global base_primes
+    shm = SharedMemory(name=shm_name)
+    try:
+        base_primes = array("q", bytes(shm.buf[:prime_count * 8]))
+    finally:
+        shm.close()
+
+
 def get_prime_numbers(search_range: SearchRange) -> SearchResult:
     stopwatch = Stopwatch()
-    prime_numbers = []
 
-    for value in range(search_range.min, search_range.max + 1):
-        if is_prime_number(value):
-            prime_numbers.append(value)
+    # segmented Sieve of Eratosthenes - for each base prime, mark its multiples within
+    # the segment covered by the search range via a strided slice assignment
+    low, high = search_range.min, search_range.max
+    sieve = bytearray(b"\x01") * (high - low + 1)
+    for value in range(low, min(high + 1, 2)):
+        sieve[value - low] = 0
+    for prime in base_primes:
+        if prime * prime > high:
+            break
+        first_multiple = max(prime * prime, -(-low // prime) * prime)
+        if first_multiple > high:
+            # this prime has no multiple within the segment, but a larger
+            # one still may (e.g. a prime dividing low exactly)
+            continue
+        sieve[first_multiple - low::prime] = b"\x00" * ((high - first_multiple) // prime + 1)
+    prime_numbers = array("q", (low + offset for offset, is_prime in enumerate(sieve) if is_prime))
 
     return SearchResult(
         process=current_process_name(),
@@ -155,10 +226,10 @@ def get_prime_numbers(search_range: SearchRange) -> SearchResult:
     )
 
 
-def write_to_file(prime_numbers: List[int], filename: str) -> None:
+def write_to_file(prime_numbers: array, filename: str) -> None:
     with open(filename, "w") as output_file:
-        for number in prime_numbers:
-            output_file.write(f"{number}\n")
+        output_file.write("\n".join(map(str, prime_numbers)))
+        output_file.write("\n")
 
 
 def format_duration(duration_sec: float) -> str:
@@ -177,27 +248,32 @@ def main() -> None:
         command_line_arguments.workers,
         command_line_arguments.executor
     )
-    future_list = []
-    
-    with create_executor(command_line_arguments.executor, command_line_arguments.workers) as executor:
-        stopwatch = Stopwatch()
-        start = command_line_arguments.start
-        while start <= command_line_arguments.end:
-            end = min(start + command_line_arguments.bulk_size - 1, command_line_arguments.end)
-            future = executor.submit(get_prime_numbers, SearchRange(start, end))
-            future_list.append(future)
-            start += command_line_arguments.bulk_size
-
-        prime_numbers = []
-        for future in future_list:
-            search_result = future.result()
-            prime_numbers += search_result.prime_numbers
-
-        duration_millis = stopwatch.elapsed_time_millis()
-        write_to_file(prime_numbers, command_line_arguments.output_file)
-        print(f"Overall number of prime numbers found: {len(prime_numbers)}")
-        print(f"Overall search duration:               {duration_millis} ms ({format_duration(duration_millis / 1000)})")
-        print(f"Batch count:                           {len(future_list)}")
+    packed_base_primes = array("q", sieve_primes(isqrt(command_line_arguments.end)))
+    shm = SharedMemory(create=True, size=max(1, len(packed_base_primes) * packed_base_primes.itemsize))
+    try:
+        shm.buf[:len(packed_base_primes) * packed_base_primes.itemsize] = packed_base_primes.tobytes()
+        with create_executor(command_line_arguments.executor, command_line_arguments.workers, shm.name, len(packed_base_primes)) as executor:
+            stopwatch = Stopwatch()
+            search_ranges = [
+                SearchRange(start, min(start + command_line_arguments.bulk_size - 1, command_line_arguments.end))
+                for start in range(command_line_arguments.start, command_line_arguments.end + 1, command_line_arguments.bulk_size)
+            ]
+            # chunksize > 1 batches the pickling of tasks, which dominates for small bulk sizes;
+            # the 4x oversubscription preserves load balance across the workers
+            chunksize = max(1, len(search_ranges) // (command_line_arguments.workers * 4))
+
+            prime_numbers = array("q")
+            for search_result in executor.map(get_prime_numbers, search_ranges, chunksize=chunksize):
+                prime_numbers += search_result.prime_numbers
+
+            duration_millis = stopwatch.elapsed_time_millis()
+            write_to_file(prime_numbers, command_line_arguments.output_file)
+            print(f"Overall number of prime numbers found: {len(prime_numbers)}")
+            print(f"Overall search duration:               {duration_millis} ms ({format_duration(duration_millis / 1000)})")
+            print(f"Batch count:                           {len(search_ranges)}")
+    finally:
+        shm.close()
+        shm.unlink()
 
 
 if __name__ == "__main__":
@@ -16,20 +16,30 @@
 # limitations under the License.
 #
 
-from asyncio import create_task, run, sleep, CancelledError
+import sys
+from asyncio import Event, create_task, run, sleep, wait_for
 from itertools import cycle
 from random import random, randint
 
 
-async def show_progress() -> None:
-    for char in cycle("\|/-"):
-        status = f"\r{char} thinking" 
-        print(status, end="", flush=True)
+# frames are encoded once - each tick is a single raw write to the stdout buffer,
+# with no per-frame f-string allocation or str-to-bytes encoding
+FRAMES = tuple(f"\r{char} thinking".encode() for char in "\\|/-")
+CLEAR = ("\r" * len(FRAMES[0])).encode()
+
+
+async def show_progress(event: Event) -> None:
+    buffer = sys.stdout.buffer
+    for frame in cycle(FRAMES):
+        buffer.write(frame)
+        buffer.flush()
         try:
-            await sleep(0.25)
-        except CancelledError: 
-            print("\r" * len(status), end="", flush=True)
-            return
+            await wait_for(event.wait(), timeout=0.25)
+        except TimeoutError:
+            continue
+        buffer.write(CLEAR)
+        buffer.flush()
+        return
 
 
 async def think() -> int:
@@ -38,9 +48,13 @@ async def think() -> int:
 
 
 async def async_main() -> int:
-    coroutine = create_task(show_progress())
+    # the event is cheaper than cancelling the task - setting a flag and waking
+    # a waiter avoids the exception unwinding CancelledError entails
+    completion_event = Event()
+    coroutine = create_task(show_progress(completion_event))
     result = await think()
-    coroutine.cancel()
+    completion_event.set()
+    await coroutine
     return result
 
 
@@ -19,12 +19,16 @@
 from itertools import cycle
 from random import random, randint
 from time import sleep
-from multiprocessing import Event, Process
+from threading import Event, Thread
+
+
+# the four status strings are built once at import time - the loop below merely
+# cycles over them instead of evaluating an f-string per tick
+FRAMES = tuple(f"\r{char} thinking" for char in "\\|/-")
 
 
 def show_progress(event: Event) -> None:
-    for char in cycle("\|/-"):
-        status = f"\r{char} thinking" 
+    for status in cycle(FRAMES):
         print(status, end="", flush=True)
         if event.wait(0.25):
             print("\r" * len(status), end="", flush=True)
@@ -38,7 +42,9 @@ def think() -> int:
 
 def main() -> None:
     completion_event = Event()
-    progress_indicator = Process(target=show_progress, args=(completion_event,))
+    # the spinner is pure I/O (sleep + print), so a daemon thread suffices - forking
+    # a whole interpreter just to tick a character costs tens of MB and ~100 ms startup
+    progress_indicator = Thread(target=show_progress, args=(completion_event,), daemon=True)
     progress_indicator.start()
     result = think()
     completion_event.set()
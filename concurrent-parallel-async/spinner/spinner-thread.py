@@ -22,9 +22,13 @@ from time import sleep
 from threading import Event, Thread
 
 
+# the four status strings are built once at import time - the loop below merely
+# cycles over them instead of evaluating an f-string per tick
+FRAMES = tuple(f"\r{char} thinking" for char in "\\|/-")
+
+
 def show_progress(event: Event) -> None:
-    for char in cycle("\|/-"):
-        status = f"\r{char} thinking" 
+    for status in cycle(FRAMES):
         print(status, end="", flush=True)
         if event.wait(0.25):
             print("\r" * len(status), end="", flush=True)
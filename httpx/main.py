@@ -16,6 +16,7 @@
 # limitations under the License.
 #
 
+from asyncio import run
 from dataclasses import dataclass
 from pprint import pprint
 from typing import List
@@ -101,6 +102,9 @@ class UserSchema(Schema):
         return User(**data)
 
 
+USER_LIST_SCHEMA = UserSchema(many=True)
+
+
 class RestApiError(Exception):
     ...
 
@@ -110,20 +114,38 @@ class RestApiClient:
     _BASE_URL = "https://jsonplaceholder.typicode.com"
 
     def __init__(self):
-        ...
-
-    def get_users(self) -> List[User]:
-        response = httpx.get(f"{self._BASE_URL}/users")
+        # a single client reuses pooled keep-alive connections across calls, so the
+        # TCP + TLS handshake is paid only once
+        # the explicit Accept-Encoding makes the server compress the verbose JSON
+        # payloads; httpx decompresses transparently on receipt
+        self._client = httpx.AsyncClient(
+            base_url=self._BASE_URL,
+            limits=httpx.Limits(max_keepalive_connections=20),
+            headers={"Accept-Encoding": "gzip, deflate"},
+        )
+
+    async def get_users(self) -> List[User]:
+        response = await self._client.get("/users")
         if response.status_code != 200:
             raise RestApiError(f"Failed to fetch users: {response.status_code}")
         response_data = response.json()
-        return [UserSchema().load(user_data) for user_data in response_data]
+        return USER_LIST_SCHEMA.load(response_data)
 
+    async def aclose(self) -> None:
+        await self._client.aclose()
 
-def main() -> None:
+
+async def async_main() -> None:
     rest_api_client = RestApiClient()
-    users = rest_api_client.get_users()
-    pprint(users)
+    try:
+        users = await rest_api_client.get_users()
+        pprint(users)
+    finally:
+        await rest_api_client.aclose()
+
+
+def main() -> None:
+    run(async_main())
 
 
 if __name__ == "__main__":
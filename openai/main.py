@@ -2,6 +2,7 @@ from argparse import ArgumentParser, Namespace, RawTextHelpFormatter
 from configparser import ConfigParser
 from dataclasses import dataclass
 from os import environ
+from pathlib import Path
 
 from openai import OpenAI
 
@@ -51,17 +52,18 @@ def parse_cmd_line_args() -> Namespace:
 
 
 def read_api_key() -> str:
-    if "OPENAI_API_KEY" not in environ:
-        raise MissingAPIKeyError("Environment variable 'OPENAI_API_KEY' is not set.")
-    result = environ["OPENAI_API_KEY"]
+    # a single environment lookup covers both the missing and the empty case
+    result = environ.get("OPENAI_API_KEY")
     if not result:
-        raise MissingAPIKeyError("Environment variable 'OPENAI_API_KEY' is empty.")
+        raise MissingAPIKeyError("Environment variable 'OPENAI_API_KEY' is not set or empty.")
     return result
 
 
 def read_configuration(filename: str) -> Configuration:
+    # read the file explicitly - ConfigParser.read silently ignores missing
+    # files, which would surface later as a confusing NoSectionError
     config_parser = ConfigParser()
-    config_parser.read(filename)
+    config_parser.read_string(Path(filename).read_text())
 
     api_key = read_api_key()
 
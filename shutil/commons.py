@@ -17,32 +17,32 @@
 #
 
 from __future__ import annotations
-from time import perf_counter
+from itertools import count
+from time import perf_counter_ns
 
 
 class Sequence:
 
     def __init__(self):
-        self._current = 1
+        self._counter = count(1)
 
     def next_value(self) -> int:
-        result = self._current
-        self._current += 1
-        return result
+        # next() on an itertools.count is a single C call, i.e. atomic under the GIL
+        return next(self._counter)
 
 
 class Stopwatch:
 
     def __init__(self) -> None:
-        self._start_time = perf_counter()
+        # perf_counter_ns is integer-native, so no float rounding is involved
+        self._start_time_ns = perf_counter_ns()
 
     @staticmethod
     def start() -> Stopwatch:
         return Stopwatch()
 
     def elapsed_time_millis(self) -> int:
-        duration = perf_counter() - self._start_time
-        return int(1000 * duration)
+        return (perf_counter_ns() - self._start_time_ns) // 1_000_000
 
 
 def format_duration(duration_millis: int) -> str:
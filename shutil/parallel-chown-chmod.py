@@ -18,13 +18,19 @@
 
 from __future__ import annotations
 from argparse import ArgumentParser, RawTextHelpFormatter
-from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from dataclasses import dataclass
 from datetime import datetime
-from os import chmod, cpu_count, scandir
+# this script is POSIX-only by nature (chown, O_DIRECTORY, dir_fd-relative
+# syscalls), so pwd/grp are imported unconditionally like the rest
+from grp import getgrnam
+from os import O_DIRECTORY, O_RDONLY, chmod, chown, close, cpu_count, scandir, stat
+from os import open as os_open
+from stat import S_IMODE
+from os.path import join
 from pathlib import Path
-from re import match
-from shutil import chown
+from pwd import getpwnam
+from re import compile
 from traceback import print_exc
 
 from commons import format_duration, Sequence, Stopwatch
@@ -32,37 +38,47 @@ from commons import format_duration, Sequence, Stopwatch
 
 MAX_WORKERS = 16
 
+PERMISSIONS_REGEX = compile(r"^[0-7]{3}$")
 
-@dataclass(frozen=True)
+# number of directories shipped to a worker in a single submission - pickling a
+# small dataclass costs about as much as a chmod, so the IPC must be amortized
+BATCH_SIZE = 256
+
+
+@dataclass(frozen=True, slots=True)
 class Configuration:
     root_path: str
     user: str
     group: str
+    uid: int
+    gid: int
     permissions: int
     workers: int
     dry_run: bool
+    force: bool
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Request:
     seq_no: int
     path: str
-    files: tuple[str, ...]
-    user: str
-    group: str
+    uid: int
+    gid: int
     permissions: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Result:
     request: Request
+    subdirectories: tuple[str, ...]
+    errors: tuple[str, ...]
     modified_file_count: int
     failed_file_count: int
     modified_dir_count: int
     failed_dir_count: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Summary:
     overall_duration_millis: int
     modified_file_count: int
@@ -77,46 +93,52 @@ class Processor:
         self._config = config
         self._executor = ProcessPoolExecutor(max_workers=config.workers)
         self._sequence = Sequence()
-        self._future_list = []
-
-    def _scan_directory(self, path: str) -> None:
-        directories = []
-        files = []
-        with scandir(path) as entries:
-            for entry in entries:
-                if entry.is_dir():
-                    directories.append(entry.path)
-                elif entry.is_file():
-                    files.append(entry.path)
-            request = Request(
-                seq_no=self._sequence.next_value(),
-                path=path,
-                files=tuple(files),
-                user=self._config.user,
-                group=self._config.group,
-                permissions=self._config.permissions,
+        self._pending_futures = set()
+
+    def _submit_directories(self, directories: list[str]) -> None:
+        for batch_start in range(0, len(directories), BATCH_SIZE):
+            batch = tuple(
+                Request(
+                    seq_no=self._sequence.next_value(),
+                    path=path,
+                    uid=self._config.uid,
+                    gid=self._config.gid,
+                    permissions=self._config.permissions,
+                )
+                for path in directories[batch_start:batch_start + BATCH_SIZE]
             )
-            future = self._executor.submit(process_request, request, self._config.dry_run)
-            self._future_list.append(future)
-        for dir in directories:
-            self._scan_directory(dir)
+            future = self._executor.submit(process_batch, batch, self._config.dry_run, self._config.force)
+            self._pending_futures.add(future)
 
-    def _collect_results(self) -> Summary:
+    def process(self) -> Summary:
+        # the workers enumerate the directories they process, so directory
+        # scanning runs in parallel with the chown/chmod work itself; the main
+        # process merely reschedules the subdirectories the workers discover
+        self._stopwatch = Stopwatch.start()
         exception_count = 0
         modified_file_count = 0
         failed_file_count = 0
         modified_dir_count = 0
         failed_dir_count = 0
-        for future in self._future_list:
-            try:
-                result = future.result()
-                modified_file_count += result.modified_file_count
-                failed_file_count += result.failed_file_count
-                modified_dir_count += result.modified_dir_count
-                failed_dir_count += result.failed_dir_count
-            except Exception as e:
-                print(f"Error in processing: {e}")
-                exception_count += 1
+        self._submit_directories([self._config.root_path])
+        while self._pending_futures:
+            completed, self._pending_futures = wait(self._pending_futures, return_when=FIRST_COMPLETED)
+            discovered_directories = []
+            for future in completed:
+                try:
+                    for result in future.result():
+                        for error in result.errors:
+                            print(error)
+                        discovered_directories.extend(result.subdirectories)
+                        modified_file_count += result.modified_file_count
+                        failed_file_count += result.failed_file_count
+                        modified_dir_count += result.modified_dir_count
+                        failed_dir_count += result.failed_dir_count
+                except Exception as e:
+                    print(f"Error in processing: {e}")
+                    exception_count += 1
+            if discovered_directories:
+                self._submit_directories(discovered_directories)
 
         return Summary(
             overall_duration_millis=self._stopwatch.elapsed_time_millis(),
@@ -127,11 +149,6 @@ class Processor:
             exception_count=exception_count,
         )
 
-    def process(self) -> Summary:
-        self._stopwatch = Stopwatch.start()
-        self._scan_directory(self._config.root_path)
-        return self._collect_results()
-
 
     def __enter__(self) -> Processor:
         return self
@@ -152,27 +169,25 @@ user and group are applied to all files and directories.
 
 def is_valid_user(user_name: str) -> bool:
     try:
-        from pwd import getpwnam
         getpwnam(user_name)
         return True
     except KeyError:
         return False
-    except ModuleNotFoundError:
-        print("The 'pwd' module is not available on this platform. User validation will be skipped.")
-        return True
-    
+
 
 def is_valid_group(group_name: str) -> bool:
     try:
-        from grp import getgrnam
         getgrnam(group_name)
         return True
     except KeyError:
         return False
-    except ModuleNotFoundError:
-        print("The 'grp' module is not available on this platform. Group validation will be skipped.")
-        return True
-    
+
+
+def resolve_ids(user_name: str, group_name: str) -> tuple[int, int]:
+    # a single name-service lookup per run - shutil.chown would repeat the
+    # pwd/grp lookups for every single file and directory
+    return getpwnam(user_name).pw_uid, getgrnam(group_name).gr_gid
+
 
 def create_cmd_line_args_parser() -> ArgumentParser:
     parser = ArgumentParser(
@@ -207,6 +222,12 @@ def create_cmd_line_args_parser() -> ArgumentParser:
         action="store_true",
         help="if specified, the script will not change any ownership or permissions (it will only print what would be changed)"
     )
+    parser.add_argument("-f", "--force",
+        dest="force",
+        default=False,
+        action="store_true",
+        help="if specified, ownership and permissions are written even if they already match the requested values"
+    )
 
     return parser
 
@@ -222,15 +243,19 @@ def parse_cmd_line_args() -> Configuration:
         parser.error(f"Group with the name '{params.group}' does not exist.")
     if not 1 <= params.workers <= MAX_WORKERS:
         parser.error(f"Number of workers must be a positive integer between 1 and {MAX_WORKERS}")
-    if not match(r'^[0-7]{3}$', params.permissions):
+    if not PERMISSIONS_REGEX.match(params.permissions):
         parser.error(f"Permissions '{params.permissions}' must be a 3 digit number (e.g. 640).")
+    uid, gid = resolve_ids(params.user, params.group)
     return Configuration(
         root_path=params.root_path,
         user=params.user,
         group=params.group,
+        uid=uid,
+        gid=gid,
         permissions=int(params.permissions, 8),
         workers=params.workers,
         dry_run=params.dry_run,
+        force=params.force,
     )
 
 
@@ -244,35 +269,81 @@ def print_prestart_info(config: Configuration) -> None:
     print()
 
 
-def process_request(request: Request, dry_run: bool) -> Result:
-    print(f"Going to process directory '{request.path}' (request #{request.seq_no})")
+def process_batch(requests: tuple[Request, ...], dry_run: bool, force: bool) -> tuple[Result, ...]:
+    return tuple(process_request(request, dry_run, force) for request in requests)
+
+
+def apply_to_path(path, stat_result, request: Request, dry_run: bool, force: bool, dir_fd=None) -> bool:
+    # idempotent reruns stay read-only - ownership and permissions are only
+    # written when they actually differ from the requested values (or --force)
+    modified = False
+    if force or stat_result.st_uid != request.uid or stat_result.st_gid != request.gid:
+        if not dry_run:
+            if dir_fd is None:
+                chown(path, request.uid, request.gid)
+            else:
+                chown(path, request.uid, request.gid, dir_fd=dir_fd, follow_symlinks=False)
+        modified = True
+    if force or S_IMODE(stat_result.st_mode) != request.permissions:
+        if not dry_run:
+            if dir_fd is None:
+                chmod(path, request.permissions)
+            else:
+                chmod(path, request.permissions, dir_fd=dir_fd)
+        modified = True
+    return modified
+
+
+def process_request(request: Request, dry_run: bool, force: bool) -> Result:
+    # no per-directory progress output - printing from every worker serializes
+    # the pool on the stdout lock; errors travel back with the result instead
     modified_file_count = 0
     failed_file_count = 0
     modified_dir_count = 0
     failed_dir_count = 0
+    errors = []
 
     try:
-        if not dry_run:
-            chown(request.path, user=request.user, group=request.group)
-            chmod(request.path, request.permissions)
-        modified_dir_count += 1
+        if apply_to_path(request.path, stat(request.path), request, dry_run, force):
+            modified_dir_count += 1
     except Exception as e:
-        print(f"Error processing directory {request.path}: {e}")
+        errors.append(f"Error processing directory {request.path}: {e}")
         failed_dir_count += 1
 
-    for file_name in request.files:
-        file_path = Path(request.path) / file_name
+    # the worker enumerates its own directory - subdirectories are reported back
+    # to the main process, which schedules them to whichever worker is free;
+    # the fd-relative syscalls spare the kernel one full path resolution per file
+    base = request.path
+    subdirectories = []
+    try:
+        dir_fd = os_open(base, O_DIRECTORY | O_RDONLY)
         try:
-            if not dry_run:
-                chown(file_path, user=request.user, group=request.group)
-                chmod(file_path, request.permissions)
-            modified_file_count += 1
-        except Exception as e:
-            print(f"Error processing file {file_path}: {e}")
-            failed_file_count += 1
+            with scandir(dir_fd) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(join(base, entry.name))
+                        continue
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    try:
+                        # the stat is served from the DirEntry cache where possible
+                        if apply_to_path(entry.name, entry.stat(follow_symlinks=False), request, dry_run, force, dir_fd=dir_fd):
+                            modified_file_count += 1
+                    except Exception as e:
+                        errors.append(f"Error processing file {join(base, entry.name)}: {e}")
+                        failed_file_count += 1
+        finally:
+            close(dir_fd)
+    except Exception as e:
+        # an unreadable or vanished directory must not take down the whole
+        # batch - report it with this request's result like any other failure
+        errors.append(f"Error scanning directory {base}: {e}")
+        failed_dir_count += 1
 
     return Result(
         request=request,
+        subdirectories=tuple(subdirectories),
+        errors=tuple(errors),
         modified_file_count=modified_file_count,
         failed_file_count=failed_file_count,
         modified_dir_count=modified_dir_count,
@@ -17,66 +17,135 @@
 #
 
 from argparse import ArgumentParser, RawTextHelpFormatter
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from datetime import datetime
-from json import dump
-from os import cpu_count, scandir
+from itertools import zip_longest
+from json import load
+from mmap import ACCESS_READ, mmap
+from multiprocessing import get_all_start_methods, get_context
+from os import cpu_count, fstat, scandir
+from os.path import join, relpath
 from pathlib import Path
 from traceback import print_exc
-from zlib import crc32
+
+try:
+    from mmap import MADV_SEQUENTIAL
+except ImportError:  # not available on Windows
+    MADV_SEQUENTIAL = None
+
+try:
+    from os import POSIX_FADV_DONTNEED, POSIX_FADV_SEQUENTIAL, posix_fadvise
+except ImportError:  # not available on Windows
+    posix_fadvise = None
+
+try:
+    # fastcrc wraps a SIMD-accelerated (PCLMULQDQ on x86-64) CRC engine; the
+    # iso-hdlc variant uses the same polynomial as zlib.crc32, so the stdlib
+    # fallback produces identical checksums, just slower
+    from fastcrc.crc32 import iso_hdlc as crc32
+    # the hashing paths below feed mmap objects and memoryview slices into
+    # crc32, which fastcrc releases reject with a TypeError (bytes only) -
+    # probe once at import time and fall back to zlib in that case
+    crc32(memoryview(b""))
+except (ImportError, TypeError):
+    from zlib import crc32
+
+try:
+    # orjson serializes straight to UTF-8 bytes several times faster than the
+    # stdlib encoder
+    from orjson import OPT_INDENT_2, dumps as dumps_json
+
+    def serialize_json(data) -> bytes:
+        return dumps_json(data, option=OPT_INDENT_2)
+except ImportError:
+    from json import dumps as dumps_json
+
+    def serialize_json(data) -> bytes:
+        return dumps_json(data, indent=4).encode("utf-8")
 
 from commons import format_duration, Sequence, Stopwatch
 
 
 MAX_WORKERS_PER_PATH = 8
 
+# files of at least this size are hashed via mmap in a single CRC call
+MMAP_MIN_SIZE = 1024 * 1024
+
+# files of at least this size are split into slices hashed by a small thread
+# pool inside the worker (the CRC engine releases the GIL on large buffers);
+# the slice checksums are then folded together via the linearity of CRC-32
+PARALLEL_CRC_MIN_SIZE = 64 * 1024 * 1024
+PARALLEL_CRC_SLICE_SIZE = 16 * 1024 * 1024
+PARALLEL_CRC_THREADS = 4
+
+# a batch of files is flushed to the pool once it reaches either bound; the
+# byte bound evens out the runtimes of batches containing large files, the
+# count bound caps the pickling cost for trees full of tiny files
+BATCH_MAX_BYTES = 64 * 1024 * 1024
+BATCH_MAX_FILES = 256
+
+# cap on in-flight requests per collector, as a multiple of the worker count -
+# keeps the workers saturated while the walk and the CRC computation overlap,
+# without piling up an unbounded future backlog on huge trees
+MAX_PENDING_FACTOR = 4
 
-@dataclass(frozen=True)
+# reads are sized as whole multiples of the filesystem's preferred I/O block
+# (st_blksize); this floor keeps the syscall count low on filesystems that
+# report tiny block sizes
+IO_BLOCK_SIZE_FLOOR = 128 * 1024
+
+
+@dataclass(frozen=True, slots=True)
 class Configuration:
     source_path: str
     destination_path: str
     diff_details_report: str
     workers_per_path: int
+    manifest: str | None
+    manifest_out: str | None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Request:
     id: str
-    root_path: str
-    path: str
     files: tuple[str, ...]
 
 
-@dataclass(frozen=True)
-class FileChecksum:
-    root_path: str
-    filename: str
-    checksum: str
-
-    @property
-    def relative_path(self) -> str:
-        return Path(self.filename).relative_to(self.root_path).as_posix()
-
-
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CRC32CollectionSummary:
     root_path: str
-    checksums: tuple[FileChecksum, ...]
+    checksums: dict[str, int]
     exception_count: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
+class ManifestCheckResult:
+    matched_paths: tuple[str, ...]
+    mismatches: tuple[tuple[str, int, int], ...]
+    unknown_paths: tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
 class ChecksumDiscrepancy:
-    source_checksum: FileChecksum
-    destination_checksum: FileChecksum
+    relative_path: str
+    source_checksum: int
+    destination_checksum: int
+
 
+@dataclass(frozen=True, slots=True)
+class SizeDiscrepancy:
+    relative_path: str
+    source_size: int
+    destination_size: int
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class ComparisonSummary:
     files_missing_in_source: tuple[str, ...]
     files_missing_in_destination: tuple[str, ...]
     checksum_discrepancies: tuple[ChecksumDiscrepancy, ...]
+    size_discrepancies: tuple[SizeDiscrepancy, ...]
     duration_millis: int
     number_of_files_in_source: int
     number_of_files_in_destination: int
@@ -95,109 +164,279 @@ class ComparisonSummary:
     def number_of_checksum_discrepancies(self) -> int:
         return len(self.checksum_discrepancies)
 
+    @property
+    def number_of_size_discrepancies(self) -> int:
+        return len(self.size_discrepancies)
+
+
+# planted into each worker process by the pool initializer - the root path (and
+# the manifest, if any) is the same for every request of a collector, so it is
+# shipped exactly once instead of once per request
+_root_path = ""
+_manifest: dict[str, int] | None = None
+
+# reused by calculate_crc32 across files, so each worker process allocates a
+# single read buffer for its whole lifetime instead of one bytes object per chunk
+_read_buffer = bytearray()
+
+
+def _initialize_worker(root_path: str, manifest: dict[str, int] | None) -> None:
+    global _root_path, _manifest, _read_buffer
+    _root_path = root_path
+    _manifest = manifest
+    # allocating the buffer here (rather than lazily on first use) means no
+    # request ever pays a startup cost - by the time the first batch arrives,
+    # the CRC engine is imported and the buffer is ready
+    _read_buffer = bytearray(IO_BLOCK_SIZE_FLOOR)
+
+
+def create_process_pool(worker_count: int, root_path: str, manifest: dict[str, int] | None) -> ProcessPoolExecutor:
+    # fork inherits the parent's already-imported modules, so worker startup is
+    # close to free; spawn (the only option on Windows) re-imports this module
+    mp_context = get_context("fork") if "fork" in get_all_start_methods() else None
+    return ProcessPoolExecutor(
+        max_workers=worker_count,
+        mp_context=mp_context,
+        initializer=_initialize_worker,
+        initargs=(root_path, manifest),
+    )
+
 
 class CRC32Collector:
 
-    def __init__(self, name: str, root_path: str, worker_count: int) -> None:
+    def __init__(self, name: str, root_path: str, worker_count: int, manifest: dict[str, int] | None = None) -> None:
         self._name = name
         self._root_path = root_path
-        self._executor = ProcessPoolExecutor(max_workers=worker_count)
+        self._worker_count = worker_count
+        self._manifest = manifest
+        self._executor = create_process_pool(worker_count, root_path, manifest)
         self._sequence = Sequence()
-        self._future_list = []
-
-    def _scan_directory(self, path: str) -> None:
-        directories = []
-        files = []
-        with scandir(path) as entries:
-            for entry in entries:
-                if entry.is_dir():
-                    directories.append(entry.path)
-                elif entry.is_file():
-                    files.append(entry.path)
-            request = Request(
-                id=f"{self._name}-{self._sequence.next_value()}",
-                root_path=self._root_path,
-                path=path,
-                files=tuple(files),
-            )
-            future = self._executor.submit(process_request, request)
-            self._future_list.append(future)
-        for dir in directories:
-            self._scan_directory(dir)
-
-    def _create_summary(self) -> CRC32CollectionSummary:
-        exception_count = 0
-        result = []
-        for future in self._future_list:
+        self._pending_futures = set()
+        self._sizes: dict[str, int] = {}
+        self._checksums: dict[str, int] = {}
+        self._matched_paths: set[str] = set()
+        self._mismatches: list[tuple[str, int, int]] = []
+        self._unknown_paths: list[str] = []
+        self._exception_count = 0
+        self._request_count = 0
+
+    def scan(self):
+        # size-gathering pass touching only directory metadata - no file is
+        # read and nothing is submitted to the pool yet; the generator pauses
+        # after every directory so several collectors can be interleaved
+        pending_directories = [self._root_path]
+        while pending_directories:
+            path = pending_directories.pop()
+            with scandir(path) as entries:
+                for entry in entries:
+                    # with follow_symlinks=False, the is_dir/is_file question is
+                    # answered from the d_type the directory entry already
+                    # carries - no stat syscall per entry
+                    if entry.is_dir(follow_symlinks=False):
+                        pending_directories.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        # DirEntry caches the stat result, so the size comes
+                        # for free for any later consumer of the same entry
+                        rel_path = relpath(entry.path, self._root_path)
+                        self._sizes[rel_path] = entry.stat(follow_symlinks=False).st_size
+            yield
+        print(f"Traversal of '{self._root_path}' completed ({len(self._sizes)} files)...")
+
+    @property
+    def sizes(self) -> dict[str, int]:
+        return self._sizes
+
+    def hash_files(self, rel_paths):
+        # hashing pass over the given subset of the scanned files; batches
+        # cross directory boundaries, so a folder with thousands of tiny files
+        # is spread over many tasks while several small folders share one -
+        # work units end up roughly equal in bytes to hash
+        batch: list[str] = []
+        batch_bytes = 0
+        for rel_path in rel_paths:
+            batch.append(join(self._root_path, rel_path))
+            batch_bytes += self._sizes[rel_path]
+            if len(batch) >= BATCH_MAX_FILES or batch_bytes >= BATCH_MAX_BYTES:
+                self._submit_batch(batch)
+                batch.clear()
+                batch_bytes = 0
+                yield
+        if batch:
+            self._submit_batch(batch)
+            yield
+        print(f"Hashing of '{self._root_path}' completed ({self._request_count} requests)...")
+
+    def _submit_batch(self, files: list[str]) -> None:
+        request = Request(
+            id=f"{self._name}-{self._sequence.next_value()}",
+            files=tuple(files),
+        )
+        # producer-consumer pipeline: the walk keeps producing requests while
+        # the workers hash; once enough requests are in flight, the walk blocks
+        # until one completes and drains its result right away
+        if len(self._pending_futures) >= MAX_PENDING_FACTOR * self._worker_count:
+            completed, self._pending_futures = wait(self._pending_futures, return_when=FIRST_COMPLETED)
+            self._drain_completed(completed)
+        worker = process_request if self._manifest is None else check_request_against_manifest
+        self._pending_futures.add(self._executor.submit(worker, request))
+        self._request_count += 1
+
+    def _drain_completed(self, completed_futures) -> None:
+        for future in completed_futures:
             try:
-                result.extend(future.result())
+                if self._manifest is None:
+                    # each result goes straight into the lookup dict - no
+                    # intermediate tuple of all checksums is ever materialized
+                    self._checksums.update(future.result())
+                else:
+                    check_result = future.result()
+                    self._matched_paths.update(check_result.matched_paths)
+                    self._mismatches.extend(check_result.mismatches)
+                    self._unknown_paths.extend(check_result.unknown_paths)
             except Exception as e:
-                exception_count += 1
+                self._exception_count += 1
                 print(f"An error occurred while processing: {e}")
                 print_exc()
 
+    def create_summary(self) -> CRC32CollectionSummary:
+        self._drain_completed(wait(self._pending_futures).done)
+        self._pending_futures.clear()
         return CRC32CollectionSummary(
             root_path=self._root_path,
-            checksums=tuple(result),
-            exception_count= exception_count,
+            checksums=self._checksums,
+            exception_count=self._exception_count,
         )
 
-    def collect(self) -> CRC32CollectionSummary:
-        self._scan_directory(self._root_path)
-        print(f"Traversal of '{self._root_path}' completed ({len(self._future_list)} requests)...")
-        return self._create_summary()
+    def create_manifest_check_result(self) -> ManifestCheckResult:
+        self._drain_completed(wait(self._pending_futures).done)
+        self._pending_futures.clear()
+        return ManifestCheckResult(
+            matched_paths=tuple(self._matched_paths),
+            mismatches=tuple(self._mismatches),
+            unknown_paths=tuple(self._unknown_paths),
+        )
+
+    @property
+    def exception_count(self) -> int:
+        return self._exception_count
 
+    # relying on __del__ for the shutdown would leave the worker processes
+    # around for as long as the garbage collector pleases - the context manager
+    # releases them deterministically, right after the collector is done
+    def __enter__(self) -> "CRC32Collector":
+        return self
 
-    def __del__(self) -> None:
-        self._executor.shutdown(wait=True)
+    def __exit__(self, exception_type, exception_value, exception_traceback) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=False)
 
 
 class Comparator:
 
     def __init__(self, config: Configuration) -> None:
-        self._source_crc_collector = CRC32Collector(
-            "Source",
-            config.source_path,
-            config.workers_per_path,
-        )
+        self._manifest = load_manifest(config.manifest) if config.manifest else None
+        self._manifest_out = config.manifest_out
+        self._source_crc_collector = None
+        if self._manifest is None:
+            self._source_crc_collector = CRC32Collector(
+                "Source",
+                config.source_path,
+                config.workers_per_path,
+            )
         self._destination_crc_collector = CRC32Collector(
             "Destination",
             config.destination_path,
             config.workers_per_path,
+            manifest=self._manifest,
         )
 
-    @staticmethod
-    def _convert_to_dict(checksums: tuple[FileChecksum, ...]) -> dict[str, FileChecksum]:
-        return {file_checksum.relative_path: file_checksum for file_checksum in checksums}
-
-    def compare(self) -> ComparisonSummary:
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            stopwatch = Stopwatch.start()
-            source_future = executor.submit(lambda: self._source_crc_collector.collect())
-            destination_future = executor.submit(lambda: self._destination_crc_collector.collect())
-        duration_millis = stopwatch.elapsed_time_millis()
-        source_summary = source_future.result()
-        destination_summary = destination_future.result()
-        source_checksums = self._convert_to_dict(source_summary.checksums)
-        destination_checksums = self._convert_to_dict(destination_summary.checksums)
-        files_missing_in_source = tuple(
-            file for file in destination_checksums if file not in source_checksums
-        )
-        files_missing_in_destination = tuple(
-            file for file in source_checksums if file not in destination_checksums
-        )
+    @property
+    def source_checksums(self) -> dict[str, int]:
+        if self._source_crc_collector is None:
+            return self._manifest
+        return self._source_crc_collector.create_summary().checksums
+
+    def _compare_against_manifest(self, stopwatch: Stopwatch) -> ComparisonSummary:
+        # the source tree is represented by the manifest - only the destination
+        # tree is walked, and the workers match checksums on the fly, so the
+        # checksums of matching files (typically almost all) never leave them;
+        # the manifest carries no sizes, hence no size-based short-circuit here
+        with self._destination_crc_collector:
+            for _ in self._destination_crc_collector.scan():
+                pass
+            destination_sizes = self._destination_crc_collector.sizes
+            for _ in self._destination_crc_collector.hash_files(sorted(destination_sizes.keys())):
+                pass
+            check_result = self._destination_crc_collector.create_manifest_check_result()
+        covered_paths = set(check_result.matched_paths)
+        covered_paths.update(mismatch[0] for mismatch in check_result.mismatches)
         checksum_discrepancies = tuple(
-            ChecksumDiscrepancy(source_checksum, destination_checksum)
-            for rel_path, source_checksum in source_checksums.items()
-            if (destination_checksum := destination_checksums.get(rel_path)) and
-               source_checksum.checksum != destination_checksum.checksum
+            ChecksumDiscrepancy(rel_path, manifest_checksum, checksum)
+            for rel_path, manifest_checksum, checksum in sorted(check_result.mismatches)
         )
+        duration_millis = stopwatch.elapsed_time_millis()
+        return ComparisonSummary(
+            number_of_files_in_source=len(self._manifest),
+            number_of_files_in_destination=len(covered_paths) + len(check_result.unknown_paths),
+            files_missing_in_source=tuple(sorted(check_result.unknown_paths)),
+            files_missing_in_destination=tuple(sorted(self._manifest.keys() - covered_paths)),
+            checksum_discrepancies=checksum_discrepancies,
+            size_discrepancies=(),
+            duration_millis=duration_millis,
+            source_exception_count=0,
+            destination_exception_count=self._destination_crc_collector.exception_count,
+        )
+
+    def compare(self) -> ComparisonSummary:
+        stopwatch = Stopwatch.start()
+        if self._manifest is not None:
+            return self._compare_against_manifest(stopwatch)
+        with self._source_crc_collector, self._destination_crc_collector:
+            # both walks are driven round-robin from this very thread - each
+            # step scans one directory, so the two trees are traversed evenly
+            # without a pair of wrapper threads taking turns on the GIL
+            for _ in zip_longest(self._source_crc_collector.scan(), self._destination_crc_collector.scan()):
+                pass
+            source_sizes = self._source_crc_collector.sizes
+            destination_sizes = self._destination_crc_collector.sizes
+            # dict_keys views subtract/intersect in C as hash-probed set operations;
+            # sorting the results makes the JSON report stable across runs
+            files_missing_in_source = tuple(sorted(destination_sizes.keys() - source_sizes.keys()))
+            files_missing_in_destination = tuple(sorted(source_sizes.keys() - destination_sizes.keys()))
+            common_paths = sorted(source_sizes.keys() & destination_sizes.keys())
+            # a size mismatch already proves the files differ (rsync's quick-check
+            # idea) - only the pairs of equal size are worth reading and hashing
+            size_discrepancies = tuple(
+                SizeDiscrepancy(rel_path, source_sizes[rel_path], destination_sizes[rel_path])
+                for rel_path in common_paths
+                if source_sizes[rel_path] != destination_sizes[rel_path]
+            )
+            files_to_hash = [
+                rel_path for rel_path in common_paths
+                if source_sizes[rel_path] == destination_sizes[rel_path]
+            ]
+            # a manifest has to cover the whole source tree, not just the subset
+            # worth comparing in this very run
+            source_files_to_hash = sorted(source_sizes.keys()) if self._manifest_out else files_to_hash
+            for _ in zip_longest(self._source_crc_collector.hash_files(source_files_to_hash),
+                                 self._destination_crc_collector.hash_files(files_to_hash)):
+                pass
+            source_summary = self._source_crc_collector.create_summary()
+            destination_summary = self._destination_crc_collector.create_summary()
+            duration_millis = stopwatch.elapsed_time_millis()
+            source_checksums = source_summary.checksums
+            destination_checksums = destination_summary.checksums
+            checksum_discrepancies = tuple(
+                ChecksumDiscrepancy(rel_path, source_checksum, destination_checksums[rel_path])
+                for rel_path in sorted(source_checksums.keys() & destination_checksums.keys())
+                if (source_checksum := source_checksums[rel_path]) != destination_checksums[rel_path]
+            )
         return ComparisonSummary(
-            number_of_files_in_source=len(source_checksums),
-            number_of_files_in_destination=len(destination_checksums),
+            number_of_files_in_source=len(source_sizes),
+            number_of_files_in_destination=len(destination_sizes),
             files_missing_in_source=files_missing_in_source,
             files_missing_in_destination=files_missing_in_destination,
             checksum_discrepancies=checksum_discrepancies,
+            size_discrepancies=size_discrepancies,
             duration_millis=duration_millis,
             source_exception_count=source_summary.exception_count,
             destination_exception_count=destination_summary.exception_count,
@@ -218,6 +457,12 @@ You can specify the number of workers to be used for the comparison. This parame
 specifies how many workers will be used to process the files in each of the two paths.
 For instance, if you specify 4 workers per path, the script will use a total of 8 workers
 (4 for the source path and 4 for the destination path).
+
+If the source tree has been checksummed before, its manifest (written via the
+--manifest-out option) can be passed via the --manifest option. The source tree is then
+not walked at all; the destination workers compare their checksums against the manifest
+on the fly and report only the discrepancies, which cuts both the I/O and the
+inter-process traffic roughly in half.
 """
 
 
@@ -246,13 +491,31 @@ def create_cmd_line_args_parser() -> ArgumentParser:
         help=f"optional number of workers per path to be used (default = 2, max = {MAX_WORKERS_PER_PATH})",
         type=int)
 
+    parser.add_argument("-m", "--manifest",
+        dest="manifest",
+        default=None,
+        help="optional manifest file from a previous --manifest-out run; if specified,\n"
+             "the manifest represents the source - the source path is not walked",
+        type=str)
+
+    parser.add_argument("--manifest-out",
+        dest="manifest_out",
+        default=None,
+        help="optional filename the source checksums are to be written to as a manifest\n"
+             "usable by subsequent --manifest runs",
+        type=str)
+
     return parser
 
 
 def parse_cmd_line_args() -> Configuration:
     parser = create_cmd_line_args_parser()
     params = parser.parse_args()
-    if not Path(params.source_path).is_dir():
+    if params.manifest is not None and params.manifest_out is not None:
+        parser.error("The options --manifest and --manifest-out are mutually exclusive.")
+    if params.manifest is not None and not Path(params.manifest).is_file():
+        parser.error(f"Manifest '{params.manifest}' is not a valid file.")
+    if params.manifest is None and not Path(params.source_path).is_dir():
         parser.error(f"Source path '{params.source_path}' is not a valid directory.")
     if not Path(params.destination_path).is_dir():
         parser.error(f"Destination path '{params.destination_path}' is not a valid directory.")
@@ -265,6 +528,8 @@ def parse_cmd_line_args() -> Configuration:
         destination_path=params.destination_path,
         diff_details_report=params.diff_details_report,
         workers_per_path=params.workers_per_path,
+        manifest=params.manifest,
+        manifest_out=params.manifest_out,
     )
 
 
@@ -277,48 +542,189 @@ def print_prestart_info(config: Configuration) -> None:
     print()
 
 
-def calculate_crc32(filepath: str) -> str:
+# lazily created thread pool shared by all huge-file hashes within one worker
+_slice_executor: ThreadPoolExecutor | None = None
+
+
+def _gf2_matrix_times(matrix: list[int], vector: int) -> int:
+    result = 0
+    index = 0
+    while vector:
+        if vector & 1:
+            result ^= matrix[index]
+        vector >>= 1
+        index += 1
+    return result
+
+
+def _gf2_matrix_square(square: list[int], matrix: list[int]) -> None:
+    for i in range(32):
+        square[i] = _gf2_matrix_times(matrix, matrix[i])
+
+
+def crc32_combine(checksum1: int, checksum2: int, length2: int) -> int:
+    # zlib's crc32_combine (not exposed by the Python binding): CRC-32 is
+    # linear over GF(2), so crc(A+B) can be derived from crc(A), crc(B) and
+    # len(B) by applying the "advance by one zero byte" operator len(B) times,
+    # done here in O(log len(B)) via repeated matrix squaring - the same math
+    # pigz uses to checksum independently compressed blocks
+    if length2 == 0:
+        return checksum1
+    even = [0] * 32
+    odd = [0] * 32
+    odd[0] = 0xEDB88320  # reflected CRC-32 polynomial
+    row = 1
+    for i in range(1, 32):
+        odd[i] = row
+        row <<= 1
+    _gf2_matrix_square(even, odd)
+    _gf2_matrix_square(odd, even)
+    while True:
+        _gf2_matrix_square(even, odd)
+        if length2 & 1:
+            checksum1 = _gf2_matrix_times(even, checksum1)
+        length2 >>= 1
+        if length2 == 0:
+            break
+        _gf2_matrix_square(odd, even)
+        if length2 & 1:
+            checksum1 = _gf2_matrix_times(odd, checksum1)
+        length2 >>= 1
+        if length2 == 0:
+            break
+    return checksum1 ^ checksum2
+
+
+def _crc32_of_slices(mapped_file, file_size: int) -> int:
+    # one huge file would otherwise pin a single core while its worker's
+    # siblings sit idle - hashing 16 MiB slices on a few threads scales the
+    # per-file throughput, and crc32_combine folds the pieces back together
+    global _slice_executor
+    if _slice_executor is None:
+        _slice_executor = ThreadPoolExecutor(max_workers=PARALLEL_CRC_THREADS)
+    with memoryview(mapped_file) as file_view:
+        slice_views = [
+            file_view[offset:offset + PARALLEL_CRC_SLICE_SIZE]
+            for offset in range(0, file_size, PARALLEL_CRC_SLICE_SIZE)
+        ]
+        try:
+            slice_checksums = list(_slice_executor.map(crc32, slice_views))
+            checksum = slice_checksums[0]
+            for slice_checksum, slice_view in zip(slice_checksums[1:], slice_views[1:]):
+                checksum = crc32_combine(checksum, slice_checksum, len(slice_view))
+        finally:
+            for slice_view in slice_views:
+                slice_view.release()
+    return checksum
+
+
+def calculate_crc32(filepath: str) -> int:
     checksum = 0
-    with open(filepath, "rb") as file:
-        for chunk in iter(lambda: file.read(256 * 1024), b""):
-            checksum = crc32(chunk, checksum)
-    return hex(checksum & 0xFFFFFFFF)  # Ensure the result is unsigned
-
-
-def process_request(request: Request) -> tuple[FileChecksum, ...]:
-    print(f"Going to process request {request.id} for path '{request.path}'")
-    result = []
-    for file in request.files:
-        file_path = Path(request.path) / file
-        if file_path.is_file():
-            crc32_value = calculate_crc32(str(file_path))
-            result.append(FileChecksum(
-                root_path=request.root_path,
-                filename=str(file_path),
-                checksum=crc32_value,
-            ))
-    return tuple(result)
+    # buffering=0 yields a raw file object - readinto fills our own buffer
+    # directly, without an intermediate copy through the stdlib buffer layer
+    with open(filepath, "rb", buffering=0) as file:
+        stat_result = fstat(file.fileno())
+        if posix_fadvise is not None:
+            posix_fadvise(file.fileno(), 0, 0, POSIX_FADV_SEQUENTIAL)
+        if stat_result.st_size >= MMAP_MIN_SIZE:
+            # mapping a large file avoids copying it chunk by chunk into Python
+            # bytes objects - the whole mapping goes into a single CRC call
+            with mmap(file.fileno(), 0, access=ACCESS_READ) as mapped_file:
+                if MADV_SEQUENTIAL is not None:
+                    # readahead hint: prefetch aggressively, drop consumed pages
+                    mapped_file.madvise(MADV_SEQUENTIAL)
+                if stat_result.st_size >= PARALLEL_CRC_MIN_SIZE:
+                    checksum = _crc32_of_slices(mapped_file, stat_result.st_size)
+                else:
+                    checksum = crc32(mapped_file, checksum)
+        else:
+            block_size = getattr(stat_result, "st_blksize", 0) or 4096
+            read_size = max(IO_BLOCK_SIZE_FLOOR // block_size, 1) * block_size
+            if len(_read_buffer) < read_size:
+                _read_buffer.extend(bytes(read_size - len(_read_buffer)))
+            with memoryview(_read_buffer) as buffer_view:
+                while byte_count := file.readinto(buffer_view):
+                    # the slice is a zero-copy view of the filled prefix
+                    checksum = crc32(buffer_view[:byte_count], checksum)
+        if posix_fadvise is not None:
+            # each file is read exactly once - dropping its pages right away
+            # keeps a multi-GiB comparison from evicting the rest of the page
+            # cache (a portable stand-in for O_DIRECT, which would impose
+            # alignment constraints and is rejected by some filesystems)
+            posix_fadvise(file.fileno(), 0, 0, POSIX_FADV_DONTNEED)
+    # kept as a plain unsigned int - 28 bytes instead of a ~60-byte hex string,
+    # and both the dict lookups and the equality checks compare machine words
+    return checksum & 0xFFFFFFFF
+
+
+def process_request(request: Request) -> tuple[tuple[str, int], ...]:
+    print(f"Going to process request {request.id} ({len(request.files)} files)")
+    # plain (relative path, checksum) pairs cross the process boundary - the
+    # relative path is derived here, where the absolute path is at hand anyway,
+    # so only two short strings per file are pickled back
+    # (the paths come straight from os.scandir, which already vetted them as
+    # regular files - no per-file Path construction or re-stat is needed)
+    return tuple(
+        (relpath(file_path, _root_path), calculate_crc32(file_path))
+        for file_path in request.files
+    )
+
+
+def check_request_against_manifest(request: Request) -> ManifestCheckResult:
+    print(f"Going to check request {request.id} ({len(request.files)} files) against the manifest")
+    matched_paths = []
+    mismatches = []
+    unknown_paths = []
+    for file_path in request.files:
+        rel_path = relpath(file_path, _root_path)
+        manifest_checksum = _manifest.get(rel_path)
+        if manifest_checksum is None:
+            unknown_paths.append(rel_path)
+            continue
+        checksum = calculate_crc32(file_path)
+        if checksum == manifest_checksum:
+            matched_paths.append(rel_path)
+        else:
+            mismatches.append((rel_path, manifest_checksum, checksum))
+    return ManifestCheckResult(
+        matched_paths=tuple(matched_paths),
+        mismatches=tuple(mismatches),
+        unknown_paths=tuple(unknown_paths),
+    )
+
+
+def load_manifest(filename: str) -> dict[str, int]:
+    with open(filename, "r", encoding="utf-8") as manifest_file:
+        return {rel_path: int(checksum, 16) for rel_path, checksum in load(manifest_file).items()}
+
+
+def write_manifest(checksums: dict[str, int], filename: str) -> None:
+    with open(filename, "wb") as manifest_file:
+        manifest_file.write(serialize_json({rel_path: f"0x{checksum:08x}" for rel_path, checksum in checksums.items()}))
+    print(f"Manifest written to '{filename}'")
 
 
 def write_json_report(comparison_summary: ComparisonSummary, filename: str) -> None:
-    with open(filename, 'w', encoding='utf-8') as file:
+    with open(filename, 'wb') as file:
         report_data = {
             "files_missing_in_source": comparison_summary.files_missing_in_source,
             "files_missing_in_destination": comparison_summary.files_missing_in_destination,
             "checksum_discrepancies": [
                 {
-                    "source_checksum": {
-                        "relative_path": discrepancy.source_checksum.relative_path,
-                        "checksum": discrepancy.source_checksum.checksum
-                    },
-                    "destination_checksum": {
-                        "relative_path": discrepancy.destination_checksum.relative_path,
-                        "checksum": discrepancy.destination_checksum.checksum
-                    }
+                    "relative_path": discrepancy.relative_path,
+                    "source_checksum": f"0x{discrepancy.source_checksum:08x}",
+                    "destination_checksum": f"0x{discrepancy.destination_checksum:08x}",
                 } for discrepancy in comparison_summary.checksum_discrepancies
+            ],
+            "size_discrepancies": [
+                {
+                    "relative_path": discrepancy.relative_path,
+                    "source_size": discrepancy.source_size,
+                    "destination_size": discrepancy.destination_size,
+                } for discrepancy in comparison_summary.size_discrepancies
             ]
         }
-        dump(report_data, file, indent=4)
+        file.write(serialize_json(report_data))
         print()
         print(f"Diff details report written to '{filename}'")
         print()
@@ -338,6 +744,7 @@ def print_summary(config: Configuration, comparison_summary: ComparisonSummary)
     print(f"Source exception(s):          {comparison_summary.source_exception_count}")
     print(f"Destination exception(s):     {comparison_summary.destination_exception_count}")
     print(f"Checksum discrepancies:       {comparison_summary.number_of_checksum_discrepancies}")
+    print(f"Size discrepancies:           {comparison_summary.number_of_size_discrepancies}")
     print()
 
 
@@ -349,6 +756,8 @@ def main() -> None:
         comparison_summary = comparator.compare()
         print_summary(config, comparison_summary)
         write_json_report(comparison_summary, config.diff_details_report)
+        if config.manifest_out is not None:
+            write_manifest(comparator.source_checksums, config.manifest_out)
     except Exception:
         print("ERROR!!! An unexpected exception has occurred.")
         print_exc()
@@ -20,8 +20,7 @@ from argparse import ArgumentParser, RawTextHelpFormatter
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
-from os import cpu_count, listdir, remove
-from os.path import isdir, join
+from os import cpu_count, remove, scandir
 from pathlib import Path
 from shutil import rmtree
 from traceback import print_exc
@@ -125,18 +124,20 @@ def remove_subdir_trees(config: Configuration) -> Summary:
         stopwatch = Stopwatch.start()
         future_list = []
         sequence = Sequence()
-        for entry in listdir(config.root_path):
-            entry_path = join(config.root_path, entry)
-            if isdir(entry_path):
-                request = Request(
-                    seq_no=sequence.next_value(),
-                    path=entry_path,
-                    dry_run=config.dry_run,
-                )
-                future = executor.submit(remove_directory, request)
-                future_list.append(future)
-            else:
-                remove(entry_path)
+        with scandir(config.root_path) as entries:
+            for entry in entries:
+                # DirEntry.is_dir is answered from the d_type the kernel
+                # returned with the directory listing - no stat per entry
+                if entry.is_dir(follow_symlinks=False):
+                    request = Request(
+                        seq_no=sequence.next_value(),
+                        path=entry.path,
+                        dry_run=config.dry_run,
+                    )
+                    future = executor.submit(remove_directory, request)
+                    future_list.append(future)
+                else:
+                    remove(entry.path)
 
         removed_tree_count = 0
         failure_count = 0
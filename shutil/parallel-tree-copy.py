@@ -17,16 +17,36 @@
 #
 
 from argparse import ArgumentParser, RawTextHelpFormatter
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime
-from os import cpu_count
+from errno import EINVAL, ENOSYS, ENOTTY, EOPNOTSUPP, EXDEV
+from os import O_CREAT, O_RDONLY, O_TRUNC, O_WRONLY, close, cpu_count, fstat, makedirs, readlink, remove, scandir, symlink
+from os import open as os_open
+from os.path import basename, join, lexists
 from pathlib import Path
-from re import compile, IGNORECASE
-from shutil import copytree
+from shutil import copyfile, copystat
 from traceback import print_exc
 from typing import Optional
 
+try:
+    # google-re2 compiles patterns to a DFA and guarantees linear-time
+    # matching even for pathological user-supplied filters; its API is a
+    # drop-in replacement for the backtracking stdlib engine
+    from re2 import compile, IGNORECASE
+except ImportError:
+    from re import compile, IGNORECASE
+
+try:
+    from os import copy_file_range
+except ImportError:  # not available outside Linux
+    copy_file_range = None
+
+try:
+    from fcntl import ioctl
+except ImportError:  # not available on Windows
+    ioctl = None
+
 from commons import format_duration, Sequence, Stopwatch
 
 
@@ -53,6 +73,7 @@ class CopyRequest:
 class CopyResult:
     request: CopyRequest
     duration_millis: int
+    failed_files: tuple[str, ...] = ()
     exception: Optional[Exception] = None
 
 
@@ -126,18 +147,33 @@ def parse_cmd_line_args() -> Configuration:
     )
 
 
+def estimate_subdir_size(path: str) -> int:
+    # one-level sum of the file sizes - a cheap proxy for the recursive size
+    # that correlates well enough to schedule the heavyweights first
+    total_size = 0
+    with scandir(path) as entries:
+        for entry in entries:
+            if entry.is_file(follow_symlinks=False):
+                total_size += entry.stat(follow_symlinks=False).st_size
+    return total_size
+
+
 def get_sorted_subdirs(config: Configuration) -> tuple[str, ...]:
     ignored_count = 0
     result = []
 
     regex = compile(config.regex_filter, IGNORECASE) if config.regex_filter else None
-    for path in Path(config.source_path).iterdir():
-        if not path.is_dir():
-            continue
-        if regex is not None and not regex.match(path.name):
+    # scandir's DirEntry answers is_dir() from the d_type delivered with the
+    # directory listing, while Path.iterdir would wrap every entry in a Path
+    # object and pay an extra stat for the is_dir check
+    with scandir(config.source_path) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            if regex is not None and not regex.match(entry.name):
                 ignored_count += 1
                 continue
-        result.append(str(path))
+            result.append(entry.path)
 
     print()
     print(f"{len(result)} relevant subdirectories found in '{config.source_path}'")
@@ -145,7 +181,11 @@ def get_sorted_subdirs(config: Configuration) -> tuple[str, ...]:
         print(f"{ignored_count} subdirectories ignored due to regex filter '{config.regex_filter}'")
     print()
 
-    return tuple(sorted(result))
+    # largest-first (LPT) ordering: if the biggest subdirectories were picked
+    # up last, all other workers would sit idle while a single one finishes
+    # them; the alphabetical pre-sort keeps ties deterministic
+    result.sort()
+    return tuple(sorted(result, key=estimate_subdir_size, reverse=True))
 
 
 def print_prestart_info(config: Configuration, source_list: tuple[str, ...]) -> None:
@@ -157,51 +197,153 @@ def print_prestart_info(config: Configuration, source_list: tuple[str, ...]) ->
     print()
 
 
+FICLONE = 0x40049409  # from <linux/fs.h>
+
+# errnos that mean "this mechanism is not supported here", as opposed to a
+# problem with the particular file - only these may disable a fast path
+_UNSUPPORTED_ERRNOS = frozenset({EINVAL, ENOSYS, ENOTTY, EOPNOTSUPP, EXDEV})
+
+# each flag is flipped to False once the mechanism turns out to be
+# unsupported, so that a kernel or filesystem without it pays the price of a
+# rejected attempt only once
+_reflink_supported = ioctl is not None
+_in_kernel_copy_supported = copy_file_range is not None
+
+
+def copy_file_data(source_fd: int, destination_fd: int) -> bool:
+    global _reflink_supported, _in_kernel_copy_supported
+    # the FICLONE ioctl asks the filesystem to share the file's extents
+    # copy-on-write (XFS, Btrfs, ZFS) - an O(metadata) operation regardless
+    # of the file size; filesystems without reflink support reject it
+    if _reflink_supported:
+        try:
+            ioctl(destination_fd, FICLONE, source_fd)
+            return True
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED_ERRNOS:
+                raise
+            _reflink_supported = False
+    # os.copy_file_range moves the bytes from page cache to page cache inside
+    # the kernel, so the payload never round-trips through a Python buffer;
+    # the syscall also releases the GIL, which lets the worker threads copy
+    # truly in parallel
+    if _in_kernel_copy_supported:
+        try:
+            remaining = fstat(source_fd).st_size
+            while remaining > 0:
+                copied = copy_file_range(source_fd, destination_fd, remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+            return True
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED_ERRNOS:
+                raise
+            _in_kernel_copy_supported = False
+    return False
+
+
+def copy_single_file(source: str, destination: str) -> None:
+    # per-file errors (EACCES, ENOENT, EIO, ...) propagate to the caller;
+    # only a genuinely unsupported fast path demotes the run to shutil
+    copied_in_kernel = False
+    if _reflink_supported or _in_kernel_copy_supported:
+        source_fd = os_open(source, O_RDONLY)
+        try:
+            destination_fd = os_open(destination, O_WRONLY | O_CREAT | O_TRUNC)
+            try:
+                copied_in_kernel = copy_file_data(source_fd, destination_fd)
+            finally:
+                close(destination_fd)
+        finally:
+            close(source_fd)
+    if not copied_in_kernel:
+        copyfile(source, destination)
+    copystat(source, destination)
+
+
+def copy_tree(source: str, destination: str, failed_files: list[str]) -> None:
+    # same recursive walk as shutil.copytree(dirs_exist_ok=True), with two
+    # deliberate differences: file payloads are copied by copy_single_file
+    # above, and symlinks are preserved instead of dereferenced;
+    # a file that cannot be copied is recorded and skipped, so one transient
+    # error does not throw away the rest of the subtree
+    makedirs(destination, exist_ok=True)
+    with scandir(source) as entries:
+        for entry in entries:
+            entry_destination = join(destination, entry.name)
+            try:
+                if entry.is_symlink():
+                    if lexists(entry_destination):
+                        remove(entry_destination)
+                    symlink(readlink(entry.path), entry_destination)
+                elif entry.is_dir(follow_symlinks=False):
+                    copy_tree(entry.path, entry_destination, failed_files)
+                else:
+                    copy_single_file(entry.path, entry_destination)
+            except OSError:
+                failed_files.append(entry.path)
+    copystat(source, destination)
+
+
 def copy_subdir(request: CopyRequest, dry_run: bool) -> CopyResult:
     print(f"Going to copy '{request.source}' to '{request.destination}' (request #{request.seq_no})")
     stopwatch = Stopwatch.start()
+    failed_files: list[str] = []
     try:
         if not dry_run:
-            copytree(request.source, request.destination, dirs_exist_ok=True)
+            copy_tree(request.source, request.destination, failed_files)
         duration_millis = stopwatch.elapsed_time_millis()
         return CopyResult(
             request=request,
-            duration_millis=duration_millis
+            duration_millis=duration_millis,
+            failed_files=tuple(failed_files)
         )
     except Exception as e:
         print_exc()
         return CopyResult(
             request=request,
             duration_millis=stopwatch.elapsed_time_millis(),
+            failed_files=tuple(failed_files),
             exception=e
         )
 
 
 def copy_subdirs(config: Configuration, source_list: tuple[str, ...]) -> Summary:
-    Path(config.destination_path).mkdir(parents=True, exist_ok=True)
+    makedirs(config.destination_path, exist_ok=True)
     stopwatch = Stopwatch()
     future_list = []
     sequence = Sequence()
 
+    # plain string joins instead of Path objects - no allocations and no
+    # re-parsing of the destination root on the submission path
+    destination_root = config.destination_path
     with ThreadPoolExecutor(max_workers=config.workers) as executor:
         for source in source_list:
-            destination = Path(config.destination_path) / Path(source).name
             request = CopyRequest(
                 seq_no=sequence.next_value(),
                 source=source,
-                destination=str(destination)
+                destination=join(destination_root, basename(source))
             )
             future = executor.submit(copy_subdir, request, config.dry_run)
             future_list.append(future)
         
         success_count = 0
         failure_count = 0
-        for future in future_list:
+        # harvest in completion order - a fast copy is reported (and its
+        # result released) immediately instead of waiting behind an earlier,
+        # still running one
+        for future in as_completed(future_list):
             result = future.result()
-            if result.exception is None:
+            if result.exception is None and not result.failed_files:
                 formatted_duration = format_duration(result.duration_millis)
                 print(f"Successfully copied '{result.request.source}' to '{result.request.destination}' in {result.duration_millis} ms ({formatted_duration})")
                 success_count += 1
+            elif result.exception is None:
+                print(f"Copied '{result.request.source}' to '{result.request.destination}' with {len(result.failed_files)} failed file(s):")
+                for failed_file in result.failed_files:
+                    print(f"  {failed_file}")
+                failure_count += 1
             else:
                 print(f"Failed to copy '{result.request.source}' to '{result.request.destination}'")
                 print(str(result.exception))